@@ -0,0 +1,82 @@
+"""
+Cold-start benchmark for the GUI.
+
+Runs `python -X importtime` on the app module several times in fresh
+interpreters, reports the median import time and the slowest top-level
+imports, and exits with status 1 if the median is over the target.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+DEFAULT_MODULE = "file_finder_gui_main"
+DEFAULT_TARGET_MS = 250.0
+
+def parse_importtime(stderr):
+    """Return [(cumulative_us, module)] for top-level imports in -X importtime output."""
+    top = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue  # header line
+        name = parts[2]
+        # Nested imports are indented under their parent, keep top-level only
+        if name.startswith(" ") and not name.startswith("  "):
+            top.append((int(parts[1]), name.strip()))
+    return top
+
+def run_once(module, script_dir):
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=script_dir, capture_output=True, text=True
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+    if proc.returncode != 0:
+        print(proc.stderr)
+        sys.exit(f"Importing {module} failed.")
+    return wall_ms, parse_importtime(proc.stderr)
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure GUI cold-start import time.")
+    parser.add_argument("--module", default=DEFAULT_MODULE, help="module to import (default: %(default)s)")
+    parser.add_argument("--runs", type=int, default=5, help="number of fresh interpreters (default: %(default)s)")
+    parser.add_argument("--target-ms", type=float, default=DEFAULT_TARGET_MS, help="fail if the median import time is above this (default: %(default)s)")
+    parser.add_argument("--top", type=int, default=10, help="how many of the slowest imports to list (default: %(default)s)")
+    args = parser.parse_args()
+
+    script_dir = os.path.abspath(os.path.dirname(__file__))
+    # First run warms the .pyc cache so every measured run sees the same state
+    run_once(args.module, script_dir)
+
+    import_ms = []
+    wall_ms = []
+    slowest = {}
+    for _ in range(args.runs):
+        wall, top = run_once(args.module, script_dir)
+        wall_ms.append(wall)
+        import_ms.append(sum(us for us, _name in top) / 1000)
+        for us, name in top:
+            slowest.setdefault(name, []).append(us / 1000)
+
+    median_import = statistics.median(import_ms)
+    print(f"Module: {args.module} ({args.runs} runs)")
+    print(f"Median import time: {median_import:.1f} ms (target {args.target_ms:.0f} ms)")
+    print(f"Median interpreter wall time: {statistics.median(wall_ms):.1f} ms")
+    print("Slowest top-level imports:")
+    ranked = sorted(((statistics.median(v), k) for k, v in slowest.items()), reverse=True)
+    for ms, name in ranked[:args.top]:
+        print(f"  {ms:8.1f} ms  {name}")
+
+    if median_import > args.target_ms:
+        print("FAIL: startup is over target.")
+        sys.exit(1)
+    print("OK")
+
+if __name__ == "__main__":
+    main()
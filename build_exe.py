@@ -5,6 +5,12 @@ import shutil
 
 SCRIPT = "file_finder_gui.py"
 EXE_NAME = "FileFinder.exe"
+# Stdlib/dev modules the app never uses; leaving them out shrinks the
+# one-file EXE and the archive it has to unpack on every start.
+EXCLUDES = [
+    "unittest", "doctest", "pydoc", "pdb", "test", "tkinter.test",
+    "lib2to3", "distutils", "setuptools", "pip", "xmlrpc", "http.server",
+]
 
 def ensure_pyinstaller():
     try:
@@ -73,8 +79,10 @@ def build():
         "--onefile",
         "--windowed",
         "--name", EXE_NAME.replace(".exe", ""),
-        SCRIPT
     ]
+    for module in EXCLUDES:
+        cmd += ["--exclude-module", module]
+    cmd.append(SCRIPT)
     subprocess.check_call(cmd)
 
 def find_and_move_exe():
@@ -0,0 +1,148 @@
+import contextlib
+import hashlib
+import json
+import os
+import tarfile
+import time
+import zipfile
+
+from file_finder_cache import get_cache_dir
+
+# Files inside archives are shown as "<archive path>!/<member path>"
+ARCHIVE_SEP = "!/"
+ZIP_EXTS = (".zip",)
+TAR_EXTS = (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+
+def is_archive(path):
+    name = path.lower()
+    return name.endswith(ZIP_EXTS) or name.endswith(TAR_EXTS)
+
+def split_virtual(path):
+    """Return (archive, member) for a path inside an archive, or None for a normal file."""
+    i = path.find(ARCHIVE_SEP)
+    while i != -1:
+        if is_archive(path[:i]):
+            return path[:i], path[i + len(ARCHIVE_SEP):]
+        i = path.find(ARCHIVE_SEP, i + 1)
+    return None
+
+def is_virtual(path):
+    return split_virtual(path) is not None
+
+def make_virtual(archive, member):
+    return archive + ARCHIVE_SEP + member
+
+def dest_layout_path(path):
+    # Where a member goes when keeping folder structure: the archive becomes a folder
+    archive, member = split_virtual(path)
+    return os.path.join(archive, *member.split("/"))
+
+def _safe_member(name):
+    """
+    Display name for a stored member name: "/" separated, or None for absolute
+    names and "..", so extracting can never leave the destination.
+    Lookups always go through the original entry, never this name.
+    """
+    name = name.replace("\\", "/")
+    parts = name.split("/")
+    if name.startswith("/") or ".." in parts or (parts and ":" in parts[0]):
+        return None
+    return name
+
+def _zip_mtime(info):
+    return time.mktime(info.date_time + (0, 0, -1))
+
+def _iter_read_members(archive):
+    """Yield (member, size, mtime) for each regular file, one header at a time."""
+    if archive.lower().endswith(ZIP_EXTS):
+        # Reads only the central directory at the end of the file
+        with zipfile.ZipFile(archive) as zf:
+            for info in zf.infolist():
+                name = _safe_member(info.filename)
+                if name and not info.is_dir():
+                    yield name, info.file_size, _zip_mtime(info)
+    else:
+        # Plain .tar skips over member data by seeking; compressed tars have to be
+        # decompressed as a stream, which is why this yields per header and is cached
+        with tarfile.open(archive, "r:*") as tf:
+            for info in tf:
+                name = _safe_member(info.name)
+                if name and info.isfile():
+                    yield name, info.size, float(info.mtime)
+
+def iter_list_archive(archive, size, mtime):
+    """
+    Yield (member, size, mtime) for the regular files in an archive.
+    Listings are cached on disk and reused while the archive's size and mtime
+    are unchanged; a fresh listing is only cached once it has been read to the end.
+    """
+    key = hashlib.sha1(os.path.abspath(archive).encode("utf-8", "surrogatepass")).hexdigest()
+    cache_file = os.path.join(get_cache_dir("archives"), key + ".json")
+    try:
+        with open(cache_file, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+        if cached["size"] == size and cached["mtime"] == mtime:
+            for member in cached["members"]:
+                yield tuple(member)
+            return
+    except (OSError, ValueError, KeyError):
+        pass
+    members = []
+    for member in _iter_read_members(archive):
+        members.append(member)
+        yield member
+    try:
+        tmp = cache_file + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"size": size, "mtime": mtime, "members": members}, f)
+        os.replace(tmp, cache_file)
+    except OSError:
+        pass
+
+def iter_open_members(archive, names):
+    """
+    Open the given members of one archive in a single pass over it.
+
+    Yields (member, file object, mtime) for every wanted member, in archive
+    order; the file object is only valid until the next item. Members that
+    are skipped yield (None, None, None), so a caller can hand control back
+    between headers while a compressed tar is being read.
+    """
+    remaining = set(names)
+    if archive.lower().endswith(ZIP_EXTS):
+        with zipfile.ZipFile(archive) as zf:
+            for info in zf.infolist():
+                if not remaining:
+                    return
+                name = _safe_member(info.filename)
+                if name in remaining and not info.is_dir():
+                    remaining.discard(name)
+                    with zf.open(info) as f:
+                        yield name, f, _zip_mtime(info)
+        return
+    with tarfile.open(archive, "r:*") as tf:
+        for info in tf:
+            if not remaining:
+                return
+            name = _safe_member(info.name)
+            if name in remaining and info.isfile():
+                remaining.discard(name)
+                f = tf.extractfile(info)
+                with f:
+                    yield name, f, float(info.mtime)
+            else:
+                yield None, None, None
+
+@contextlib.contextmanager
+def open_member(path):
+    """Open a single file inside an archive for streaming reads."""
+    archive, member = split_virtual(path)
+    members = iter_open_members(archive, [member])
+    try:
+        for name, f, _mtime in members:
+            if name is not None:
+                yield f
+                return
+        raise FileNotFoundError(f"{member} is not a regular file in {archive}")
+    finally:
+        members.close()
@@ -0,0 +1,8 @@
+import os
+
+def get_cache_dir(*parts):
+    """Per-user cache folder for the app, e.g. %LOCALAPPDATA%\\SuperEasyFileFinder on Windows."""
+    base = os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    path = os.path.join(base, "SuperEasyFileFinder", *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
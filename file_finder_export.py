@@ -0,0 +1,184 @@
+import csv
+import json
+import os
+
+# Columns written by every exporter, in order.
+EXPORT_COLUMNS = ["path", "size", "mtime", "hash", "dup_group"]
+
+# Rows are written in chunks so memory stays bounded no matter how many files
+# are exported, and each chunk goes out in a single write call.
+CHUNK_ROWS = 10000
+BUFFER_SIZE = 1024 * 1024
+
+EXPORT_FILETYPES = [
+    ("CSV files", "*.csv"),
+    ("JSON Lines files", "*.jsonl"),
+    ("Parquet files (needs pyarrow)", "*.parquet"),
+    ("Arrow files (needs pyarrow)", "*.arrow"),
+    ("Text files", "*.txt"),
+]
+
+def get_format(filename):
+    ext = os.path.splitext(filename)[1].lower()
+    if ext in (".csv", ".jsonl", ".parquet", ".arrow"):
+        return ext[1:]
+    if ext == ".ndjson":
+        return "jsonl"
+    return "txt"
+
+def iter_chunks(rows, size=CHUNK_ROWS):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def _write_txt(filename, rows):
+    count = 0
+    with open(filename, "w", encoding="utf-8", buffering=BUFFER_SIZE) as f:
+        for chunk in iter_chunks(rows):
+            f.write("".join(row[0] + "\n" for row in chunk))
+            count += len(chunk)
+    return count
+
+def _write_csv(filename, rows):
+    count = 0
+    with open(filename, "w", encoding="utf-8", newline="", buffering=BUFFER_SIZE) as f:
+        writer = csv.writer(f)
+        writer.writerow(EXPORT_COLUMNS)
+        for chunk in iter_chunks(rows):
+            writer.writerows(chunk)
+            count += len(chunk)
+    return count
+
+def _json_scalar(value):
+    return "null" if value is None else repr(value)
+
+def _jsonl_line(row, encode_str=json.JSONEncoder(ensure_ascii=False).encode):
+    # Hand-built object: much faster than json-encoding a dict per row
+    path, size, mtime, hash_, group = row
+    return (f'{{"path": {encode_str(path)}, "size": {_json_scalar(size)}, "mtime": {_json_scalar(mtime)}, '
+            f'"hash": {"null" if hash_ is None else encode_str(hash_)}, "dup_group": {_json_scalar(group)}}}\n')
+
+def _write_jsonl(filename, rows):
+    count = 0
+    with open(filename, "w", encoding="utf-8", buffering=BUFFER_SIZE) as f:
+        for chunk in iter_chunks(rows):
+            f.write("".join(map(_jsonl_line, chunk)))
+            count += len(chunk)
+    return count
+
+def _load_pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise RuntimeError("Parquet/Arrow export needs the optional 'pyarrow' package (pip install pyarrow).")
+    return pyarrow
+
+def _arrow_schema(pa):
+    return pa.schema([
+        ("path", pa.string()),
+        ("size", pa.int64()),
+        ("mtime", pa.float64()),
+        ("hash", pa.string()),
+        ("dup_group", pa.int64()),
+    ])
+
+def _arrow_batch(pa, schema, chunk):
+    columns = list(zip(*chunk))
+    return pa.record_batch([pa.array(col, type=field.type) for col, field in zip(columns, schema)], schema=schema)
+
+def _write_parquet(filename, rows):
+    pa = _load_pyarrow()
+    import pyarrow.parquet as pq
+    schema = _arrow_schema(pa)
+    count = 0
+    with pq.ParquetWriter(filename, schema) as writer:
+        for chunk in iter_chunks(rows):
+            writer.write_batch(_arrow_batch(pa, schema, chunk))
+            count += len(chunk)
+    return count
+
+def _write_arrow(filename, rows):
+    pa = _load_pyarrow()
+    schema = _arrow_schema(pa)
+    count = 0
+    with pa.OSFile(filename, "wb") as sink, pa.ipc.new_file(sink, schema) as writer:
+        for chunk in iter_chunks(rows):
+            writer.write_batch(_arrow_batch(pa, schema, chunk))
+            count += len(chunk)
+    return count
+
+WRITERS = {
+    "txt": _write_txt,
+    "csv": _write_csv,
+    "jsonl": _write_jsonl,
+    "parquet": _write_parquet,
+    "arrow": _write_arrow,
+}
+
+def export_rows(filename, rows):
+    """
+    Stream (path, size, mtime, hash, dup_group) rows to filename.
+    The format is picked from the file extension. Returns the number of rows written.
+    """
+    return WRITERS[get_format(filename)](filename, rows)
+
+def _to_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+def import_rows(filename):
+    """
+    Yield (path, size, mtime) tuples from a list saved by export_rows.
+    size and mtime are None when the file does not carry them (e.g. .txt lists).
+    """
+    fmt = get_format(filename)
+    if fmt == "txt":
+        with open(filename, "r", encoding="utf-8", buffering=BUFFER_SIZE) as f:
+            for line in f:
+                path = line.rstrip("\r\n")
+                if path:
+                    yield path, None, None
+    elif fmt == "csv":
+        with open(filename, "r", encoding="utf-8", newline="", buffering=BUFFER_SIZE) as f:
+            for row in csv.DictReader(f):
+                if row.get("path"):
+                    yield row["path"], _to_int(row.get("size")), _to_float(row.get("mtime"))
+    elif fmt == "jsonl":
+        with open(filename, "r", encoding="utf-8", buffering=BUFFER_SIZE) as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                row = json.loads(line)
+                if row.get("path"):
+                    yield row["path"], _to_int(row.get("size")), _to_float(row.get("mtime"))
+    else:
+        for batch in _iter_arrow_batches(filename, fmt):
+            data = batch.to_pydict()
+            for path, size, mtime in zip(data["path"], data["size"], data["mtime"]):
+                if path:
+                    yield path, size, mtime
+
+def _iter_arrow_batches(filename, fmt):
+    # The memory map is closed once the batches have been read (or the import stops early)
+    pa = _load_pyarrow()
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+        yield from pq.ParquetFile(filename).iter_batches(batch_size=CHUNK_ROWS, columns=["path", "size", "mtime"])
+    else:
+        with pa.memory_map(filename, "r") as source:
+            reader = pa.ipc.open_file(source)
+            for i in range(reader.num_record_batches):
+                yield reader.get_batch(i)
@@ -1,11 +1,12 @@
 import os
-import shutil
 import sys
 import tkinter as tk
-from tkinter import filedialog, messagebox, ttk
-from collections import defaultdict
-from datetime import datetime
-import traceback
+from tkinter import messagebox, ttk
+from file_finder_scheduler import CooperativeTask
+from file_finder_store import ResultStore
+
+# Keep module load cheap: shutil, traceback, tkinter.filedialog and the
+# export engine are imported inside the functions that use them.
 
 PRESETS = {
     "Images": [".jpg", ".jpeg", ".png", ".gif", ".bmp", ".tiff"],
@@ -13,12 +14,152 @@ PRESETS = {
     "Images & Videos": [".jpg", ".jpeg", ".png", ".gif", ".bmp", ".tiff", ".mp4", ".avi", ".mov", ".mkv", ".wmv"]
 }
 
-def get_file_size(path):
+def get_created_time(st):
+    """
+    When this copy of a file was made, from its os.stat() result. Duplicates
+    share name and mtime, so mtime can't tell copies apart. st_birthtime
+    where the OS records it (macOS, BSD, Windows on Python 3.12+), else
+    st_ctime: the creation time on Windows, the last metadata change
+    (written, moved, renamed, chmod) on Linux.
+    """
+    return getattr(st, "st_birthtime", st.st_ctime)
+
+CREATED_TIME_HINT = ("Newest/oldest compare when each copy was made: its creation time on Windows and macOS, "
+                     "its last metadata change (copy, move, rename, permissions) on Linux.")
+
+def _created_score(entry, sign):
+    # Files whose creation time wasn't recorded are never the one kept
+    created = entry[2]
+    return float("-inf") if created is None else sign * created
+
+# Bulk duplicate rules: each maps (path, (size, mtime, created)) to a score, the highest score is kept.
+# Ties keep the earlier file in the group. Everything comes from the scan, nothing is read from disk.
+RESOLVE_POLICIES = {
+    "Keep newest": lambda f, entry: _created_score(entry, 1),
+    "Keep oldest": lambda f, entry: _created_score(entry, -1),
+    "Keep largest": lambda f, entry: entry[0],
+    "Keep smallest": lambda f, entry: -entry[0],
+    "Keep shortest path": lambda f, entry: -len(f),
+}
+PREFER_FOLDER_POLICY = "Keep file in folder"
+
+# Rows shown in the results list; larger result sets stay in the store only
+LISTBOX_LIMIT = 100000
+# Duplicate groups whose thumbnails are made ahead of the one on screen
+PREFETCH_GROUPS = 5
+THUMB_COLUMNS = 6
+
+def get_peak_rss():
+    """Peak resident memory of this process in bytes, or 0 if it can't be read."""
     try:
-        return os.path.getsize(path)
+        if sys.platform == "win32":
+            import ctypes
+            from ctypes import wintypes
+            class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+                _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD)] + [
+                    (name, ctypes.c_size_t) for name in (
+                        "PeakWorkingSetSize", "WorkingSetSize", "QuotaPeakPagedPoolUsage",
+                        "QuotaPagedPoolUsage", "QuotaPeakNonPagedPoolUsage", "QuotaNonPagedPoolUsage",
+                        "PagefileUsage", "PeakPagefileUsage")]
+            counters = PROCESS_MEMORY_COUNTERS()
+            counters.cb = ctypes.sizeof(counters)
+            handle = ctypes.windll.kernel32.GetCurrentProcess()
+            if not ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+                return 0
+            return counters.PeakWorkingSetSize
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports KB, macOS bytes
+        return peak if sys.platform == "darwin" else peak * 1024
     except Exception:
         return 0
 
+def is_inside(path, folder):
+    """True if path is somewhere below folder, comparing absolute, case-normalized paths."""
+    path = os.path.normcase(os.path.abspath(path))
+    return path.startswith(os.path.join(os.path.normcase(os.path.abspath(folder)), ""))
+
+# "Keep All" / "Skip All Duplicates": every file scores the same, so the first one is kept
+KEEP_FIRST = lambda f, entry: 0
+
+def get_policy_score(policy, prefer_folder=""):
+    if policy == PREFER_FOLDER_POLICY:
+        prefix = os.path.join(os.path.normcase(os.path.abspath(prefer_folder)), "")
+        return lambda f, entry: os.path.normcase(f).startswith(prefix)
+    return RESOLVE_POLICIES[policy]
+
+def resolve_group(entries, score):
+    """
+    Pick the file to keep in one duplicate group of (path, size, mtime, created) entries.
+    Returns the entries to leave out.
+    """
+    keep = max(entries, key=lambda e: score(e[0], e[1:]))
+    return [e for e in entries if e is not keep]
+
+COPY_CHUNK_SIZE = 1024 * 1024
+
+def iter_copy_file(src, dst):
+    """
+    Copy src to dst with metadata like shutil.copy2, yielding after every
+    chunk so a single huge file does not freeze the GUI.
+    Data goes to a temporary file next to dst that replaces it at the end,
+    so a failed or cancelled copy never truncates or removes an existing dst.
+    """
+    import shutil
+    if os.path.exists(dst) and os.path.samefile(src, dst):
+        raise shutil.SameFileError(f"{src!r} and {dst!r} are the same file")
+    tmp = dst + ".partial"
+    try:
+        with open(src, "rb") as fsrc, open(tmp, "wb") as fdst:
+            while True:
+                buf = fsrc.read(COPY_CHUNK_SIZE)
+                if not buf:
+                    break
+                fdst.write(buf)
+                yield
+        shutil.copystat(src, tmp)
+        os.replace(tmp, dst)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+def iter_move_file(src, dst):
+    # Same drive: a rename is instant. Otherwise copy in chunks, then remove.
+    try:
+        os.replace(src, dst)
+        return
+    except OSError:
+        pass
+    yield from iter_copy_file(src, dst)
+    os.remove(src)
+
+def iter_write_stream(fsrc, dst, mtime=None):
+    """
+    Write an open file object (e.g. an archive member) to dst in chunks, like
+    iter_copy_file, then set dst's mtime.
+    """
+    tmp = dst + ".partial"
+    try:
+        with open(tmp, "wb") as fdst:
+            while True:
+                buf = fsrc.read(COPY_CHUNK_SIZE)
+                if not buf:
+                    break
+                fdst.write(buf)
+                yield
+        if mtime:
+            os.utime(tmp, (mtime, mtime))
+        os.replace(tmp, dst)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
 def format_size(size):
     for unit in ['bytes', 'KB', 'MB', 'GB', 'TB']:
         if size < 1024.0:
@@ -36,8 +177,13 @@ class FileFinderApp:
         self.selected_preset = tk.StringVar(value="Images")
         self.custom_types = tk.StringVar()
         self.keep_structure = tk.BooleanVar(value=True)
-        self.files_found = []
-        self.duplicates = []
+        self.scan_archives = tk.BooleanVar(value=False)
+        self.files_found = ResultStore()
+        # Duplicate group shown in step 3 as (group id, entries); the groups themselves live in the store
+        self.dup_group = None
+        self.list_imported = False
+        # Folders an imported list's paths sit in, used instead of step 0's folders when copying
+        self.import_base_folders = []
         self.total_size = 0
         self.dest_folder = tk.StringVar()
         self.current_step = 0
@@ -60,17 +206,45 @@ class FileFinderApp:
         self.copy_keep_struct = False
         self.copy_overwrite = ""
         self.copy_base_folders = []
+        # Long operations run as cooperative tasks on the Tk event loop, one at a time
+        self.task = None
+        # Thumbnail cache for duplicate review, created on first use
+        self.thumbs = None
+        self.thumb_images = []
+        self.thumb_pending = {}
         self.build_gui()
         self.show_step(0)
+        self.update_status_bar()
 
     def pause_resume(self):
         # Dummy pause/resume for compatibility (no threading)
         messagebox.showinfo("Pause/Resume", "Pause/Resume is not available in this version.")
 
     def stop_operation(self):
-        # Dummy stop for compatibility (no threading)
+        # The running task stops at its next slice boundary
         self.stop_flag = True
-        messagebox.showinfo("Stop", "Stop is not available in this version.")
+        if self.task is not None:
+            self.task.cancel()
+
+    def run_task(self, work, on_progress=None, on_done=None):
+        if self.task is not None:
+            messagebox.showerror("Error", "An operation is already running.")
+            return False
+        def done(task):
+            self.task = None
+            if on_done:
+                on_done(task)
+        self.task = CooperativeTask(self.root, work, on_progress=on_progress, on_done=done).start()
+        return True
+
+    def show_task_error(self, task, what):
+        # Tasks catch exceptions into task.error; report it so a failure never looks like success
+        if task.error is None:
+            return False
+        import traceback
+        traceback.print_exception(type(task.error), task.error, task.error.__traceback__)
+        messagebox.showerror("Error", f"{what}: {task.error}")
+        return True
 
     def build_gui(self):
         self.root.rowconfigure(0, weight=1)
@@ -83,6 +257,9 @@ class FileFinderApp:
         # Add a help/info button
         help_btn = ttk.Button(self.main_frame, text="Help / Info", command=self.show_help)
         help_btn.grid(row=2, column=0, sticky="e", pady=(0, 5))
+        # Status bar: peak memory and whether results live on disk
+        self.status_bar = ttk.Label(self.main_frame, text="", foreground="gray")
+        self.status_bar.grid(row=2, column=0, sticky="w", pady=(0, 5))
 
         # Step 0: Folder selection
         step0 = ttk.Frame(self.main_frame)
@@ -114,6 +291,7 @@ class FileFinderApp:
         # Add tooltips for presets
         preset_tip = ttk.Label(step1, text="Presets: Images, Videos, or both. Custom: comma-separated extensions (e.g. .docx,.pdf)", foreground="gray")
         preset_tip.grid(row=1, column=0, columnspan=3, sticky="w")
+        ttk.Checkbutton(step1, text="Also look inside ZIP/TAR archives", variable=self.scan_archives).grid(row=2, column=0, columnspan=3, sticky="w", pady=(5,0))
         step1.columnconfigure(1, weight=1)
         self.steps.append(step1)
 
@@ -142,6 +320,8 @@ class FileFinderApp:
         ttk.Button(sel_frame, text="Deselect All", command=lambda: self.result_list.select_clear(0, tk.END)).pack(side="left", padx=2)
         # Add export list button
         ttk.Button(sel_frame, text="Export List", command=self.export_file_list).pack(side="left", padx=2)
+        # Load a saved list instead of searching again
+        ttk.Button(sel_frame, text="Import List", command=self.import_file_list).pack(side="left", padx=2)
         self.steps.append(step2)
 
         # Step 3: Duplicate handling
@@ -158,6 +338,25 @@ class FileFinderApp:
         # Add skip all duplicates button
         self.dup_skip_btn = ttk.Button(step3, text="Skip All Duplicates", command=self.skip_all_duplicates)
         self.dup_skip_btn.grid(row=1, column=0, sticky="w", pady=(5,0))
+        # Add export duplicates report button
+        ttk.Button(step3, text="Export Duplicates", command=self.export_duplicates).grid(row=1, column=2, sticky="e", pady=(5,0))
+        # Resolve every group at once with a rule
+        rule_frame = ttk.Frame(step3)
+        rule_frame.grid(row=3, column=0, columnspan=3, sticky="w", pady=(10,0))
+        ttk.Label(rule_frame, text="Resolve all by rule:").pack(side="left")
+        self.resolve_policy = tk.StringVar(value=next(iter(RESOLVE_POLICIES)))
+        policies = list(RESOLVE_POLICIES) + [PREFER_FOLDER_POLICY]
+        ttk.Combobox(rule_frame, textvariable=self.resolve_policy, values=policies, state="readonly", width=20).pack(side="left", padx=2)
+        self.prefer_folder = tk.StringVar()
+        ttk.Entry(rule_frame, textvariable=self.prefer_folder, width=30).pack(side="left", padx=2)
+        ttk.Button(rule_frame, text="Browse", command=self.browse_prefer_folder).pack(side="left", padx=2)
+        ttk.Button(rule_frame, text="Preview", command=lambda: self.apply_resolve_policy(dry_run=True)).pack(side="left", padx=2)
+        ttk.Button(rule_frame, text="Apply", command=self.apply_resolve_policy).pack(side="left", padx=2)
+        ttk.Label(step3, text=CREATED_TIME_HINT, foreground="gray").grid(row=4, column=0, columnspan=3, sticky="w")
+        # Thumbnails of the current duplicate group, click one to keep it
+        self.thumb_frame = ttk.Frame(step3)
+        self.thumb_frame.grid(row=2, column=0, columnspan=3, sticky="nsew", pady=(10,0))
+        step3.rowconfigure(2, weight=1)
         step3.columnconfigure(1, weight=1)
         self.steps.append(step3)
 
@@ -214,8 +413,24 @@ class FileFinderApp:
         self.root.minsize(900, 600)
         self.root.protocol("WM_DELETE_WINDOW", self.on_close)
 
+    def update_status_bar(self):
+        text = f"Peak memory: {format_size(get_peak_rss())}"
+        if self.files_found.spilled:
+            text += f"  |  {len(self.files_found)} results stored on disk"
+        self.status_bar.config(text=text)
+        self.root.after(1000, self.update_status_bar)
+
+    def set_results(self, store):
+        # Replace the result store, removing the old one's temp file
+        if store is not self.files_found:
+            self.files_found.close()
+        self.files_found = store
+
     def on_close(self):
         # Clean up and close safely
+        self.files_found.close()
+        if self.thumbs is not None:
+            self.thumbs.shutdown()
         try:
             self.root.destroy()
         except Exception:
@@ -234,8 +449,7 @@ class FileFinderApp:
         selection = self.result_list.curselection()
         if selection:
             files_to_delete = [self.result_list.get(i).split("  [")[0] for i in selection]
-            for f in files_to_delete:
-                self.files_found.remove(f)
+            self.files_found.remove_many(files_to_delete)
             for i in reversed(selection):
                 self.result_list.delete(i)
             self.update_progress()
@@ -246,17 +460,32 @@ class FileFinderApp:
             files_to_delete = [self.result_list.get(i).split("  [")[0] for i in selection]
             if messagebox.askyesno("Delete Files", f"Are you sure you want to permanently delete {len(files_to_delete)} files from your system?"):
                 errors = []
-                for f in files_to_delete:
-                    try:
-                        os.remove(f)
-                        self.files_found.remove(f)
-                    except Exception as e:
-                        errors.append(f"{f}: {e}")
-                for i in reversed(selection):
-                    self.result_list.delete(i)
-                self.update_progress()
-                if errors:
-                    messagebox.showerror("Error", "\n".join(errors))
+                deleted = set()
+                def work():
+                    from file_finder_archives import is_virtual
+                    for f in files_to_delete:
+                        if is_virtual(f):
+                            errors.append(f"{f}: files inside archives can't be deleted")
+                            yield
+                            continue
+                        try:
+                            os.remove(f)
+                            deleted.add(f)
+                        except Exception as e:
+                            errors.append(f"{f}: {e}")
+                        yield
+                def progress(task):
+                    self.progress.config(text=f"Deleting... {task.units_done}/{len(files_to_delete)}")
+                def done(task):
+                    self.files_found.remove_many(deleted)
+                    for i in reversed(selection):
+                        self.result_list.delete(i)
+                    self.update_progress()
+                    if self.show_task_error(task, "Deleting stopped"):
+                        return
+                    if errors:
+                        messagebox.showerror("Error", "\n".join(errors))
+                self.run_task(work(), on_progress=progress, on_done=done)
 
     def add_folder_row(self, path=""):
         idx = len(self.folder_entries)
@@ -293,6 +522,7 @@ class FileFinderApp:
             radio.config(value=i)
 
     def browse_folder_row(self, idx):
+        from tkinter import filedialog
         folder = filedialog.askdirectory()
         if folder:
             self.folder_entries[idx][0].set(folder)
@@ -347,7 +577,7 @@ class FileFinderApp:
                 return
         if self.current_step == 2:
             self.find_files()
-            if self.duplicates:
+            if self.has_duplicates():
                 self.show_step(3)
                 return
         if self.current_step < len(self.steps) - 1:
@@ -357,26 +587,140 @@ class FileFinderApp:
         if self.current_step > 0:
             self.show_step(self.current_step - 1)
 
+    def iter_export_rows(self):
+        # One row per file: path, size, mtime, hash, duplicate group id
+        for f, size, mtime, group in self.files_found.items():
+            # No content hashing yet: the column is kept so the layout stays stable, but left empty (null)
+            yield (f, size, mtime, None, group)
+
+    def iter_duplicate_pages(self):
+        # Pages of (group id, entries) from the store, only one page is held at a time
+        after = -1
+        while True:
+            page = self.files_found.duplicate_groups(after)
+            if not page:
+                return
+            yield page
+            after = page[-1][0]
+
+    def iter_duplicate_rows(self, totals):
+        for page in self.iter_duplicate_pages():
+            for gid, entries in page:
+                totals["groups"] += 1
+                for f, size, mtime, _created in entries:
+                    yield (f, size, mtime, None, gid)
+
+    def has_duplicates(self):
+        return bool(self.files_found.duplicate_groups(limit=1))
+
+    def ask_export_file(self, title):
+        from tkinter import filedialog
+        from file_finder_export import EXPORT_FILETYPES
+        return filedialog.asksaveasfilename(defaultextension=".csv", filetypes=EXPORT_FILETYPES, title=title)
+
     def export_file_list(self):
         if not self.files_found:
             messagebox.showinfo("Export", "No files to export.")
             return
-        file = filedialog.asksaveasfilename(defaultextension=".txt", filetypes=[("Text files","*.txt")])
+        file = self.ask_export_file("Export file list")
         if file:
-            with open(file, "w", encoding="utf-8") as f:
-                for item in self.files_found:
-                    f.write(item + "\n")
-            messagebox.showinfo("Export", f"File list exported to {file}")
+            from file_finder_export import export_rows
+            try:
+                count = export_rows(file, self.iter_export_rows())
+            except Exception as e:
+                messagebox.showerror("Export", f"Export failed: {e}")
+                return
+            messagebox.showinfo("Export", f"{count} files exported to {file}")
+
+    def export_duplicates(self):
+        if not self.has_duplicates():
+            messagebox.showinfo("Export", "No duplicates to export.")
+            return
+        file = self.ask_export_file("Export duplicate report")
+        if file:
+            from file_finder_export import export_rows
+            totals = {"groups": 0}
+            try:
+                count = export_rows(file, self.iter_duplicate_rows(totals))
+            except Exception as e:
+                messagebox.showerror("Export", f"Export failed: {e}")
+                return
+            messagebox.showinfo("Export", f"{count} duplicate entries in {totals['groups']} groups exported to {file}")
+
+    def import_file_list(self):
+        from tkinter import filedialog
+        file = filedialog.askopenfilename(
+            filetypes=[("File lists", "*.csv *.jsonl *.ndjson *.parquet *.arrow *.txt"), ("All files", "*.*")],
+            title="Import file list")
+        if not file:
+            return
+        from file_finder_export import import_rows
+        from file_finder_archives import split_virtual
+        found = ResultStore()
+        rows = []
+        bases = {}  # drive -> deepest folder holding every imported file on it
+        def add_base(path):
+            virtual = split_virtual(path)
+            folder = os.path.dirname(os.path.abspath(virtual[0] if virtual else path))
+            drive = os.path.normcase(os.path.splitdrive(folder)[0])
+            common = bases.get(drive)
+            if common is None:
+                bases[drive] = folder
+            elif not is_inside(folder, common) and folder != common:
+                bases[drive] = os.path.commonpath([common, folder])
+        def work():
+            for path, size, mtime in import_rows(file):
+                # Lists don't carry creation times, read them once here (for archive members, the archive's)
+                virtual = split_virtual(path)
+                try:
+                    st = os.stat(virtual[0] if virtual else path)
+                    created = get_created_time(st)
+                except Exception:
+                    st = created = None
+                if size is None or mtime is None:
+                    if st is not None and not virtual:
+                        size, mtime = st.st_size, st.st_mtime
+                    else:
+                        size, mtime = 0, 0.0
+                if found.add(path, size, mtime, created):
+                    add_base(path)
+                    if len(found) <= LISTBOX_LIMIT:
+                        rows.append(f"{path}  [{format_size(size)}]")
+                yield
+        def flush(task):
+            if rows:
+                self.result_list.insert(tk.END, *rows)
+                rows.clear()
+            self.progress.config(text=f"Importing... {len(found)} files")
+        def done(task):
+            if task.error is not None or task.cancelled:
+                found.close()
+                self.show_task_error(task, "Import failed")
+                return
+            print(f"[DEBUG] Imported {len(found)} files from {file}")
+            self.set_results(found)
+            self.list_imported = True
+            self.import_base_folders = list(bases.values())
+            self.update_progress()
+            self.check_duplicates()
+        if self.task is not None:
+            messagebox.showerror("Error", "An operation is already running.")
+            return
+        self.result_list.delete(0, tk.END)
+        self.run_task(work(), on_progress=flush, on_done=done)
+
+    def fill_result_list(self):
+        rows = []
+        for f, size, _mtime, _group in self.files_found.items():
+            if len(rows) >= LISTBOX_LIMIT:
+                break
+            rows.append(f"{f}  [{format_size(size)}]")
+        if rows:
+            self.result_list.insert(tk.END, *rows)
 
     def skip_all_duplicates(self):
         # Remove all duplicates except the first in each group
-        for group in self.duplicates:
-            keep = group[0]
-            for f in group[1:]:
-                if f in self.files_found:
-                    self.files_found.remove(f)
-        self.duplicates = []
-        self.update_duplicate_ui()
+        self.resolve_all_duplicates(KEEP_FIRST)
 
     def show_step(self, idx):
         # Hide all steps
@@ -394,6 +738,10 @@ class FileFinderApp:
         if idx == 2:
             self.progress.config(text="")
             self.result_list.delete(0, tk.END)
+            # An imported list is the current result set, show it again
+            if self.list_imported:
+                self.fill_result_list()
+                self.update_progress()
         if idx == 3:
             self.update_duplicate_ui()
         self.root.update_idletasks()
@@ -410,11 +758,19 @@ class FileFinderApp:
             if not types:
                 messagebox.showerror("Error", "Please select at least one file type.")
                 return
+        if self.current_step in (0, 1):
+            # Folders or types may have changed, so step 2 searches again
+            self.list_imported = False
         if self.current_step == 2:
-            self.find_files()
-            if self.duplicates:
-                self.show_step(3)
+            if self.task is not None:
+                messagebox.showinfo("Please wait", "Please wait for the current operation to finish.")
                 return
+            # An imported list replaces the search, don't rescan over it
+            if self.list_imported:
+                self.show_step(3)
+            else:
+                self.find_files(on_done=lambda: self.show_step(3))
+            return
         if self.current_step < len(self.steps) - 1:
             self.show_step(self.current_step + 1)
 
@@ -423,11 +779,13 @@ class FileFinderApp:
             self.show_step(self.current_step - 1)
 
     def browse_folder(self):
+        from tkinter import filedialog
         folder = filedialog.askdirectory()
         if folder:
             self.selected_folder.set(folder)
 
     def browse_dest(self):
+        from tkinter import filedialog
         folder = filedialog.askdirectory()
         if folder:
             self.dest_folder.set(folder)
@@ -444,79 +802,252 @@ class FileFinderApp:
             return [x.strip() for x in self.custom_types.get().split(",") if x.strip()]
         return PRESETS.get(preset, [])
 
-    def find_files(self):
-        types = self.get_selected_types()
-        self.progress.config(text="Searching...")
-        self.root.update()
-        found = []
-        print(f"[DEBUG] Searching in folders: {self.selected_folders} for types: {types}")
+    def iter_scan(self, types, found, rows):
+        # One unit per directory entry; matching files are buffered in rows for the listbox
+        if self.scan_archives.get():
+            from file_finder_archives import is_archive
+        else:
+            is_archive = None
         for folder in self.selected_folders:
             for rootdir, _, files in os.walk(folder):
                 for f in files:
                     ext = os.path.splitext(f)[1].lower()
                     if ext in types:
                         full_path = os.path.join(rootdir, f)
-                        found.append(full_path)
-        print(f"[DEBUG] Found {len(found)} files")
-        self.files_found = found
-        self.total_size = sum(get_file_size(f) for f in found)
+                        # One stat gives both size and the mtime used for duplicates
+                        try:
+                            st = os.stat(full_path)
+                            size, mtime, created = st.st_size, st.st_mtime, get_created_time(st)
+                        except Exception:
+                            size, mtime, created = 0, 0, None
+                        # Overlapping folders find the same file twice, list it once
+                        if found.add(full_path, size, mtime, created) and len(found) <= LISTBOX_LIMIT:
+                            rows.append(f"{full_path}  [{format_size(size)}]")
+                    if is_archive and is_archive(f):
+                        yield from self.iter_scan_archive(os.path.join(rootdir, f), types, found, rows)
+                    yield
+                yield
+
+    def iter_scan_archive(self, archive, types, found, rows):
+        from file_finder_archives import iter_list_archive, make_virtual
+        # One unit per member header, so a big compressed tar is read across many slices
+        try:
+            st = os.stat(archive)
+            # Members were made along with the archive, so they share its creation time
+            created = get_created_time(st)
+            for name, size, mtime in iter_list_archive(archive, st.st_size, st.st_mtime):
+                if os.path.splitext(name)[1].lower() in types:
+                    path = make_virtual(archive, name)
+                    if found.add(path, size, mtime, created) and len(found) <= LISTBOX_LIMIT:
+                        rows.append(f"{path}  [{format_size(size)}]")
+                yield
+        except Exception as e:
+            print(f"[DEBUG] Could not read archive {archive}: {e}")
+
+    def find_files(self, on_done=None):
+        types = set(self.get_selected_types())
+        self.list_imported = False
+        found = ResultStore()
+        rows = []
+        print(f"[DEBUG] Searching in folders: {self.selected_folders} for types: {types}")
+        def flush(task):
+            # Coalesced listbox update: one insert call per progress tick
+            if rows:
+                self.result_list.insert(tk.END, *rows)
+                rows.clear()
+            self.progress.config(text=f"Searching... found {len(found)} files, {format_size(found.total_size)}")
+        def done(task):
+            print(f"[DEBUG] Found {len(found)} files")
+            self.set_results(found)
+            self.update_progress()
+            # Keep what was found so far, like a cancelled search, but don't carry on
+            if self.show_task_error(task, "Search stopped, showing the files found so far") or task.cancelled:
+                return
+            self.check_duplicates(on_done=on_done)
+            if not found:
+                messagebox.showinfo("No Files Found", "No files matching your criteria were found. Try a different folder or file type.")
+        if self.task is not None:
+            messagebox.showerror("Error", "An operation is already running.")
+            return
         self.result_list.delete(0, tk.END)
-        for f in found:
-            size = get_file_size(f)
-            self.result_list.insert(tk.END, f"{f}  [{format_size(size)}]")
-        self.update_progress()
-        self.check_duplicates()
-        if not found:
-            messagebox.showinfo("No Files Found", "No files matching your criteria were found. Try a different folder or file type.")
+        self.progress.config(text="Searching...")
+        self.run_task(self.iter_scan(types, found, rows), on_progress=flush, on_done=done)
 
     def update_progress(self):
-        self.total_size = sum(get_file_size(f) for f in self.files_found)
-        self.progress.config(text=f"Found {len(self.files_found)} files, total size: {format_size(self.total_size)}")
+        self.total_size = self.files_found.total_size
+        text = f"Found {len(self.files_found)} files, total size: {format_size(self.total_size)}"
+        if len(self.files_found) > LISTBOX_LIMIT:
+            text += f" (showing the first {LISTBOX_LIMIT})"
+        self.progress.config(text=text)
 
-    def check_duplicates(self):
-        file_map = defaultdict(list)
-        for f in self.files_found:
-            name = os.path.basename(f)
-            try:
-                mtime = os.path.getmtime(f)
-            except Exception:
-                mtime = 0
-            key = (name, mtime)
-            file_map[key].append(f)
-        self.duplicates = [v for v in file_map.values() if len(v) > 1]
+    def check_duplicates(self, on_done=None):
+        # Same name and mtime, grouped by the result store (in memory or in SQLite)
+        def done(task):
+            if self.show_task_error(task, "Checking for duplicates failed"):
+                return
+            if on_done and not task.cancelled:
+                on_done()
+        self.run_task(self.files_found.find_duplicates(), on_done=done)
 
     def update_duplicate_ui(self):
-        if not self.duplicates:
+        # Only the first open group is read from the store
+        page = self.files_found.duplicate_groups(limit=1)
+        self.dup_group = page[0] if page else None
+        if self.dup_group is None:
             self.dup_label.config(text="No duplicates found.")
             self.dup_choice["values"] = []
             self.dup_choice.set("")
             self.dup_keep_btn["state"] = "disabled"
         else:
-            dups = self.duplicates[0]
+            dups = [entry[0] for entry in self.dup_group[1]]
             self.dup_label.config(text=f"Duplicate found: {os.path.basename(dups[0])}")
             self.dup_choice["values"] = dups
             self.dup_choice.current(0)
             self.dup_keep_btn["state"] = "normal"
+        self.show_thumbnails()
+
+    def get_thumbs(self):
+        if self.thumbs is None:
+            from file_finder_thumbs import ThumbnailCache
+            self.thumbs = ThumbnailCache()
+        return self.thumbs
+
+    def show_thumbnails(self):
+        for widget in self.thumb_frame.winfo_children():
+            widget.destroy()
+        self.thumb_images = []
+        # A new dict per group, so a poll loop for an old group stops by itself
+        self.thumb_pending = {}
+        if self.dup_group is None:
+            return
+        from file_finder_thumbs import can_preview
+        thumbs = self.get_thumbs()
+        for i, (f, size, mtime, _created) in enumerate(self.dup_group[1]):
+            caption = f"{os.path.dirname(f)}\n{format_size(size)}"
+            label = ttk.Label(self.thumb_frame, text=caption, compound="top", wraplength=180, cursor="hand2")
+            label.grid(row=i // THUMB_COLUMNS, column=i % THUMB_COLUMNS, padx=4, pady=4, sticky="n")
+            label.bind("<Button-1>", lambda e, f=f: self.dup_choice.set(f))
+            if not can_preview(f):
+                continue
+            cached = thumbs.lookup(f, size, mtime)
+            if cached:
+                self.set_thumbnail(label, cached)
+            else:
+                label.config(text="Loading preview...\n" + caption)
+                self.thumb_pending[f] = (thumbs.request(f, size, mtime), label, caption)
+        self.prefetch_thumbnails()
+        if self.thumb_pending:
+            self.root.after(50, self.poll_thumbnails, self.thumb_pending)
+
+    def prefetch_thumbnails(self):
+        from file_finder_thumbs import can_preview
+        thumbs = self.get_thumbs()
+        for _gid, entries in self.files_found.duplicate_groups(self.dup_group[0], PREFETCH_GROUPS):
+            for f, size, mtime, _created in entries:
+                if can_preview(f):
+                    if thumbs.lookup(f, size, mtime) is None:
+                        thumbs.request(f, size, mtime)
+
+    def poll_thumbnails(self, pending):
+        if pending is not self.thumb_pending:
+            return
+        for f, (future, label, caption) in list(pending.items()):
+            if not future.done():
+                continue
+            del pending[f]
+            thumb = None if future.cancelled() or future.exception() else future.result()
+            if thumb:
+                self.set_thumbnail(label, thumb, caption)
+            else:
+                label.config(text="No preview\n" + caption)
+        if pending:
+            self.root.after(50, self.poll_thumbnails, pending)
+
+    def set_thumbnail(self, label, thumb, caption=None):
+        try:
+            image = tk.PhotoImage(file=thumb)
+        except tk.TclError:
+            return
+        # Tk drops images that are no longer referenced from Python
+        self.thumb_images.append(image)
+        label.config(image=image)
+        if caption is not None:
+            label.config(text=caption)
 
     def keep_duplicate(self):
-        if not self.duplicates:
+        if self.dup_group is None:
             return
+        gid, entries = self.dup_group
         keep = self.dup_choice.get()
-        for f in self.duplicates[0]:
-            if f != keep and f in self.files_found:
-                self.files_found.remove(f)
-        self.duplicates.pop(0)
+        self.files_found.remove_many(entry[0] for entry in entries if entry[0] != keep)
+        self.files_found.close_groups([gid])
         self.update_duplicate_ui()
 
+    def browse_prefer_folder(self):
+        from tkinter import filedialog
+        folder = filedialog.askdirectory()
+        if folder:
+            self.prefer_folder.set(folder)
+            self.resolve_policy.set(PREFER_FOLDER_POLICY)
+
+    def iter_resolve_duplicates(self, score, totals, apply=False):
+        # One unit per group; with apply, each page's left-out files are removed before the next page is read
+        for page in self.iter_duplicate_pages():
+            remove = []
+            for _gid, entries in page:
+                left_out = resolve_group(entries, score)
+                totals["groups"] += 1
+                totals["files"] += len(left_out)
+                totals["bytes"] += sum(entry[1] for entry in left_out)
+                if apply:
+                    remove.extend(entry[0] for entry in left_out)
+                yield
+            if apply:
+                # Removing a whole page at once is one long unit, so remove it a few hundred at a time
+                for i in range(0, len(remove), 500):
+                    self.files_found.remove_many(remove[i:i + 500])
+                    yield
+                self.files_found.close_groups(gid for gid, _entries in page)
+
+    def resolve_all_duplicates(self, score):
+        totals = {"groups": 0, "files": 0, "bytes": 0}
+        def progress(task):
+            self.dup_label.config(text=f"Resolving... {totals['groups']} groups")
+        def done(task):
+            self.update_duplicate_ui()
+            self.update_progress()
+            self.show_task_error(task, "Resolving duplicates stopped")
+        self.run_task(self.iter_resolve_duplicates(score, totals, apply=True), on_progress=progress, on_done=done)
+
+    def apply_resolve_policy(self, dry_run=False):
+        if not self.has_duplicates():
+            messagebox.showinfo("Resolve Duplicates", "No duplicates to resolve.")
+            return
+        policy = self.resolve_policy.get()
+        if policy == PREFER_FOLDER_POLICY and not self.prefer_folder.get():
+            messagebox.showerror("Error", "Please choose the folder whose copies should be kept.")
+            return
+        score = get_policy_score(policy, self.prefer_folder.get())
+        # A first pass only counts, so the summary can be confirmed before anything is removed
+        totals = {"groups": 0, "files": 0, "bytes": 0}
+        def progress(task):
+            self.dup_label.config(text=f"Checking rule... {totals['groups']} groups")
+        def done(task):
+            self.update_duplicate_ui()
+            if self.show_task_error(task, "Resolving duplicates failed") or task.cancelled:
+                return
+            summary = (f"{policy}: {totals['groups']} duplicate groups.\n"
+                       f"{totals['files']} files will be left out, saving {format_size(totals['bytes'])}.")
+            if dry_run:
+                messagebox.showinfo("Resolve Duplicates (preview)", summary)
+                return
+            if messagebox.askyesno("Resolve Duplicates", summary + "\n\nApply this rule to all groups?"):
+                self.resolve_all_duplicates(score)
+        self.run_task(self.iter_resolve_duplicates(score, totals), on_progress=progress, on_done=done)
+
     def keep_all_duplicates(self):
         # Keep the first file in each duplicate group, remove others from self.files_found
-        for group in self.duplicates:
-            keep = group[0]
-            for f in group[1:]:
-                if f in self.files_found:
-                    self.files_found.remove(f)
-        self.duplicates = []
-        self.update_duplicate_ui()
+        self.resolve_all_duplicates(KEEP_FIRST)
 
     def start_copy_move(self, move=False):
         if self.is_running:
@@ -542,7 +1073,8 @@ class FileFinderApp:
             self.reset_ui()
             return
 
-        self.copy_queue = list(files_to_copy)
+        # Iterate the store lazily instead of copying every path into a new list
+        self.copy_queue = iter(files_to_copy)
         self.copy_total = len(files_to_copy)
         self.copy_index = 0
         self.copy_errors = []
@@ -551,99 +1083,141 @@ class FileFinderApp:
         self.copy_dest = dest
         self.copy_keep_struct = keep_struct
         self.copy_overwrite = overwrite
-        self.copy_base_folders = sorted(self.selected_folders, key=lambda x: -len(x))
+        # An imported list doesn't come from step 0's folders, keep structure below its own folders
+        base_folders = self.import_base_folders if self.list_imported else self.selected_folders
+        self.copy_base_folders = sorted(base_folders, key=lambda x: -len(x))
         self.progress_bar["maximum"] = self.copy_total
         self.copy_btn["state"] = "disabled"
         self.move_btn["state"] = "disabled"
         self.copying = True
-        self.root.after(10, self.copy_move_step_nonblocking)
-
-    def copy_move_step_nonblocking(self):
-        # Process a batch of files per event loop to keep GUI responsive
-        BATCH_SIZE = 10
-        processed = 0
-        while self.copying and not self.stop_flag and self.copy_index < self.copy_total and processed < BATCH_SIZE:
-            f = self.copy_queue[self.copy_index]
-            base_folders = self.copy_base_folders
-            def get_base_folder(f):
-                for b in base_folders:
-                    if f.startswith(b):
-                        return b
-                return base_folders[0] if base_folders else ""
-            base_folder = get_base_folder(f)
-            rel_path = os.path.relpath(f, base_folder) if self.copy_keep_struct else os.path.basename(f)
-            if self.copy_keep_struct:
-                last_folder = os.path.basename(base_folder)
-                rel_path = os.path.join(last_folder, rel_path)
+        if not self.run_task(self.iter_copy_move(), on_progress=self.copy_move_progress, on_done=self.copy_move_done):
+            self.copying = False
+            self.reset_ui()
+
+    def iter_copy_move(self):
+        from file_finder_archives import split_virtual
+        # One unit per chunk copied, so huge files still let the GUI breathe
+        base_folders = self.copy_base_folders
+        def get_base_folder(f):
+            for b in base_folders:
+                if is_inside(f, b):
+                    return b
+            return None
+        def get_dest_path(layout):
+            base_folder = get_base_folder(layout)
+            # Files outside every base folder are copied flat, relpath would climb out with ".."
+            if self.copy_keep_struct and base_folder is not None:
+                last_folder = os.path.basename(os.path.normpath(base_folder))
+                rel_path = os.path.join(last_folder, os.path.relpath(layout, base_folder))
             else:
-                rel_path = os.path.basename(f)
-            dest_path = os.path.join(self.copy_dest, rel_path)
-            try:
-                os.makedirs(os.path.dirname(dest_path), exist_ok=True)
-            except Exception as e:
-                self.copy_errors.append(f"Error creating directory for {dest_path}: {e}")
-                print(f"[DEBUG] Error creating directory: {e}")
-                self.copy_index += 1
-                processed += 1
+                rel_path = os.path.basename(layout)
+            return os.path.join(self.copy_dest, rel_path)
+        file_transfer = iter_move_file if self.copy_move_flag else iter_copy_file
+        # Archive members are collected and extracted afterwards, one pass per archive
+        archive_members = {}
+        for f in self.copy_queue:
+            if not self.copying or self.stop_flag:
+                return
+            virtual = split_virtual(f)
+            if virtual is not None:
+                archive, member = virtual
+                archive_members.setdefault(archive, {})[member] = f
                 continue
+            yield from self.iter_place_file(f, get_dest_path(f), lambda dst: file_transfer(f, dst))
+            self.copy_index += 1
+            yield
+        for archive, members in archive_members.items():
+            if not self.copying or self.stop_flag:
+                return
+            yield from self.iter_extract_archive(archive, members, get_dest_path)
 
-            try:
-                if os.path.exists(dest_path):
-                    if self.copy_overwrite == "skip":
-                        print(f"[DEBUG] Skipping (exists): {dest_path}")
-                    elif self.copy_overwrite == "overwrite":
-                        if self.copy_move_flag:
-                            shutil.move(f, dest_path)
-                        else:
-                            shutil.copy2(f, dest_path)
-                        self.copy_copied += 1
-                        print(f"[DEBUG] Overwrote: {dest_path}")
-                    elif self.copy_overwrite == "autorename":
-                        dest_path = self.get_autorename_path(dest_path)
-                        if self.copy_move_flag:
-                            shutil.move(f, dest_path)
-                        else:
-                            shutil.copy2(f, dest_path)
-                        self.copy_copied += 1
-                        print(f"[DEBUG] Auto-renamed and copied: {dest_path}")
-                else:
-                    if self.copy_move_flag:
-                        shutil.move(f, dest_path)
-                    else:
-                        shutil.copy2(f, dest_path)
+    def iter_place_file(self, f, dest_path, transfer):
+        # Creates the folder, applies the "If file exists" choice, then runs transfer(dest_path)
+        import traceback
+        if not is_inside(dest_path, self.copy_dest):
+            self.copy_errors.append(f"{f}: {dest_path} is outside the destination folder")
+            print(f"[DEBUG] Refusing to write outside the destination: {dest_path}")
+            return
+        try:
+            os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+        except Exception as e:
+            self.copy_errors.append(f"Error creating directory for {dest_path}: {e}")
+            print(f"[DEBUG] Error creating directory: {e}")
+            return
+
+        try:
+            if os.path.exists(dest_path):
+                if self.copy_overwrite == "skip":
+                    print(f"[DEBUG] Skipping (exists): {dest_path}")
+                elif self.copy_overwrite == "overwrite":
+                    yield from transfer(dest_path)
                     self.copy_copied += 1
-                    print(f"[DEBUG] Copied: {dest_path}")
-            except Exception as e:
-                self.copy_errors.append(f"{f}: {e}")
-                print(f"[DEBUG] Error copying {dest_path}: {e}")
-                print(traceback.format_exc())
+                    print(f"[DEBUG] Overwrote: {dest_path}")
+                elif self.copy_overwrite == "autorename":
+                    dest_path = self.get_autorename_path(dest_path)
+                    yield from transfer(dest_path)
+                    self.copy_copied += 1
+                    print(f"[DEBUG] Auto-renamed and copied: {dest_path}")
+            else:
+                yield from transfer(dest_path)
+                self.copy_copied += 1
+                print(f"[DEBUG] Copied: {dest_path}")
+        except Exception as e:
+            self.copy_errors.append(f"{f}: {e}")
+            print(f"[DEBUG] Error copying {dest_path}: {e}")
+            print(traceback.format_exc())
 
+    def iter_extract_archive(self, archive, members, get_dest_path):
+        """
+        Extract the queued members ({member: virtual path}) of one archive in a
+        single pass over it. Members are streamed to the destination; the
+        archive itself is never modified, even on move.
+        """
+        import contextlib
+        from file_finder_archives import dest_layout_path, iter_open_members
+        error = None
+        try:
+            with contextlib.closing(iter_open_members(archive, list(members))) as opened:
+                for name, fsrc, mtime in opened:
+                    if not self.copying or self.stop_flag:
+                        return
+                    if name is None:
+                        # Skipped a member we don't want; let the GUI breathe between headers
+                        yield
+                        continue
+                    f = members.pop(name)
+                    yield from self.iter_place_file(f, get_dest_path(dest_layout_path(f)),
+                                                    lambda dst: iter_write_stream(fsrc, dst, mtime))
+                    self.copy_index += 1
+                    yield
+        except Exception as e:
+            error = e
+            print(f"[DEBUG] Error reading archive {archive}: {e}")
+        for f in members.values():
+            self.copy_errors.append(f"{f}: {error or 'not found in archive'}")
             self.copy_index += 1
-            processed += 1
 
-        self.progress_bar["value"] = self.copy_index
-        self.progress_label.config(text=f"Processed: {self.copy_index}/{self.copy_total}")
-        self.root.update_idletasks()
+    def copy_move_progress(self, task):
+        self.update_progress_bar(self.copy_index, self.copy_total)
 
-        if self.stop_flag or self.copy_index >= self.copy_total:
-            self.copying = False
-            self.reset_ui()
-            msg = f"Copied {self.copy_copied} files."
-            if self.copy_errors:
-                msg += f"\n{len(self.copy_errors)} errors occurred."
+    def copy_move_done(self, task):
+        from tkinter import filedialog
+        self.copying = False
+        self.reset_ui()
+        msg = f"Copied {self.copy_copied} files."
+        if self.copy_errors:
+            msg += f"\n{len(self.copy_errors)} errors occurred."
+        failed = self.show_task_error(task, f"{msg}\nStopped by an error")
+        if not failed:
             messagebox.showinfo("Done", msg)
-            if self.copy_errors:
-                errfile = filedialog.asksaveasfilename(defaultextension=".txt", filetypes=[("Text files","*.txt")], title="Save error log?")
-                if errfile:
-                    with open(errfile, "w", encoding="utf-8") as f:
-                        for line in self.copy_errors:
-                            f.write(line + "\n")
-            if self.copy_move_flag and not self.copy_errors:
-                self.find_files()
-            return
-
-        # Schedule next batch
-        self.root.after(10, self.copy_move_step_nonblocking)
+        if self.copy_errors:
+            errfile = filedialog.asksaveasfilename(defaultextension=".txt", filetypes=[("Text files","*.txt")], title="Save error log?")
+            if errfile:
+                with open(errfile, "w", encoding="utf-8") as f:
+                    for line in self.copy_errors:
+                        f.write(line + "\n")
+        if self.copy_move_flag and not self.copy_errors and not task.cancelled and not failed:
+            self.find_files()
 
     def update_progress_bar(self, value, total):
         self.progress_bar["value"] = value
@@ -667,7 +1241,7 @@ class FileFinderApp:
         self.pause_resume_btn["text"] = "Pause"
         self.stop_btn["state"] = "disabled"
 
-if __name__ == "__main__":
+def main():
     try:
         root = tk.Tk()
     except Exception as e:
@@ -688,7 +1262,11 @@ if __name__ == "__main__":
                 pass  # Already set geometry above
         root.mainloop()
     except Exception as e:
+        import traceback
         print("An error occurred while running the app:")
         traceback.print_exc()
         input("Press Enter to exit...")
-        sys.exit(1)
\ No newline at end of file
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+import time
+
+# Target time for one slice of work, about one frame at 60 Hz
+FRAME_BUDGET = 0.016
+# Widgets are refreshed at most this often while a task runs
+PROGRESS_INTERVAL = 0.1
+
+class CooperativeTask:
+    """
+    Runs a generator on the Tk event loop without blocking it.
+
+    Every next() on the generator is one unit of work (a file scanned, a
+    chunk copied, ...). Units run in slices scheduled with after(); after
+    each slice the batch size is rescaled from the measured time per unit
+    so a slice fills, but does not exceed, the frame budget. on_progress is
+    called at most every progress_interval seconds so widget updates are
+    coalesced, and once more at the end. on_done gets the task, with
+    .cancelled and .error set.
+    """
+
+    def __init__(self, root, work, on_progress=None, on_done=None,
+                 frame_budget=FRAME_BUDGET, progress_interval=PROGRESS_INTERVAL,
+                 min_batch=1, max_batch=100000):
+        self.root = root
+        self.work = iter(work)
+        self.on_progress = on_progress
+        self.on_done = on_done
+        self.frame_budget = frame_budget
+        self.progress_interval = progress_interval
+        self.min_batch = min_batch
+        self.max_batch = max_batch
+        self.batch_size = min_batch
+        self.units_done = 0
+        self.running = False
+        self.cancelled = False
+        self.error = None
+        self._after_id = None
+        self._last_progress = 0.0
+
+    def start(self):
+        self.running = True
+        self._after_id = self.root.after(1, self._run_slice)
+        return self
+
+    def cancel(self):
+        # Takes effect at the next slice boundary, never mid-unit
+        self.cancelled = True
+
+    def _run_slice(self):
+        self._after_id = None
+        if self.cancelled:
+            self._finish()
+            return
+        finished = False
+        done = 0
+        start = time.perf_counter()
+        try:
+            while done < self.batch_size:
+                next(self.work)
+                done += 1
+        except StopIteration:
+            finished = True
+        except Exception as e:
+            self.error = e
+            finished = True
+        elapsed = time.perf_counter() - start
+        self.units_done += done
+        self._adapt(done, elapsed)
+        if finished:
+            self._finish()
+            return
+        now = time.perf_counter()
+        if self.on_progress and now - self._last_progress >= self.progress_interval:
+            self._last_progress = now
+            self.on_progress(self)
+        # after(1) rather than after_idle so pending input/redraw events run first
+        self._after_id = self.root.after(1, self._run_slice)
+
+    def _adapt(self, done, elapsed):
+        if done == 0:
+            return
+        if elapsed <= 0:
+            target = self.batch_size * 2
+        else:
+            target = int(self.frame_budget / (elapsed / done))
+        # Grow gradually, shrink immediately when a slice overruns
+        target = min(target, self.batch_size * 2)
+        self.batch_size = max(self.min_batch, min(self.max_batch, target))
+
+    def _finish(self):
+        self.running = False
+        if self.cancelled or self.error is not None:
+            close = getattr(self.work, "close", None)
+            if close:
+                close()
+        if self.on_progress:
+            self.on_progress(self)
+        if self.on_done:
+            self.on_done(self)
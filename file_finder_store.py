@@ -0,0 +1,332 @@
+import os
+from collections import defaultdict
+
+# Past this many files the results move from memory to a temporary SQLite file
+SPILL_THRESHOLD = 200000
+# Rows per query when reading back from disk, and per executemany when writing
+PAGE_SIZE = 5000
+# Once spilled, one bit per hash(path) (8 MB) lets most new paths skip the "already stored?" query
+SEEN_BITS = 1 << 26
+
+class ResultStore:
+    """
+    Ordered set of found files with their size, mtime and creation time.
+
+    Small result sets live in a dict. Once spill_threshold files have been
+    added, everything is moved to a temporary SQLite database and read back
+    page by page, so memory use stays flat however many files are found.
+    Iteration yields paths in the order they were added.
+
+    find_duplicates() numbers the groups of files sharing name and mtime;
+    the group ids live next to the files (a column once spilled), so the
+    groups are paged through with duplicate_groups() rather than held in
+    Python lists.
+    """
+
+    def __init__(self, spill_threshold=SPILL_THRESHOLD):
+        self.spill_threshold = spill_threshold
+        self.total_size = 0
+        self._mem = {}  # path -> (size, mtime, created)
+        self._group_of = {}  # path -> duplicate group id, while in memory
+        self._groups = []  # group id -> paths, while in memory
+        self._pending = []  # rows waiting for the next executemany once spilled
+        self._pending_paths = set()
+        self._seen = None
+        self._db = None
+        self._db_path = None
+        self._count = 0
+
+    @property
+    def spilled(self):
+        return self._db is not None
+
+    def _open_db(self):
+        # sqlite3 is only loaded once a scan is big enough to need it
+        import sqlite3
+        import tempfile
+        fd, self._db_path = tempfile.mkstemp(prefix="filefinder-", suffix=".sqlite")
+        os.close(fd)
+        self._db = sqlite3.connect(self._db_path)
+        # Scratch data: no journal, no fsync, small page cache
+        self._db.execute("PRAGMA journal_mode=OFF")
+        self._db.execute("PRAGMA synchronous=OFF")
+        self._db.execute("PRAGMA cache_size=-16000")
+        self._db.execute(
+            "CREATE TABLE files (id INTEGER PRIMARY KEY, path TEXT UNIQUE, name TEXT, size INTEGER, mtime REAL, "
+            "created REAL, dup_group INTEGER)"
+        )
+        # Kept up to date by every insert, so grouping duplicates never has to build it in one go
+        self._db.execute("CREATE INDEX files_name_mtime ON files (name, mtime)")
+        # Only grouped files are in this index, so it costs nothing while scanning
+        self._db.execute("CREATE INDEX files_dup_group ON files (dup_group) WHERE dup_group IS NOT NULL")
+        self._seen = bytearray(SEEN_BITS // 8)
+        for path in self._mem:
+            self._seen_before(path)
+        group_of = self._group_of
+        rows = ((p, os.path.basename(p), s, m, c, group_of.get(p)) for p, (s, m, c) in self._mem.items())
+        self._db.executemany(
+            "INSERT INTO files (path, name, size, mtime, created, dup_group) VALUES (?, ?, ?, ?, ?, ?)", rows
+        )
+        self._db.commit()
+        self._mem = {}
+        self._group_of = {}
+        self._groups = []
+
+    def _flush(self):
+        if self._pending:
+            self._db.executemany(
+                "INSERT INTO files (path, name, size, mtime, created) VALUES (?, ?, ?, ?, ?)", self._pending
+            )
+            self._db.commit()
+            self._pending = []
+            self._pending_paths = set()
+
+    def _seen_before(self, path):
+        # Marks path and returns whether its bit was already set (maybe stored, maybe a collision)
+        h = hash(path) & (SEEN_BITS - 1)
+        byte, bit = h >> 3, 1 << (h & 7)
+        seen = self._seen[byte] & bit
+        self._seen[byte] |= bit
+        return seen
+
+    def add(self, path, size, mtime, created=None):
+        """
+        Add a file; created is when this copy was made, or None if unknown.
+        Returns False, and changes nothing, if the path is already in the store.
+        """
+        if self._db is None:
+            if path in self._mem:
+                return False
+            self._mem[path] = (size, mtime, created)
+            self._count += 1
+            self.total_size += size
+            if self._count > self.spill_threshold:
+                self._open_db()
+            return True
+        if self._seen_before(path) and (
+            path in self._pending_paths or self._db.execute("SELECT 1 FROM files WHERE path = ?", (path,)).fetchone()
+        ):
+            return False
+        self._pending.append((path, os.path.basename(path), size, mtime, created))
+        self._pending_paths.add(path)
+        self._count += 1
+        self.total_size += size
+        if len(self._pending) >= PAGE_SIZE:
+            self._flush()
+        return True
+
+    def __len__(self):
+        return self._count
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def __contains__(self, path):
+        return self.get(path) is not None
+
+    def get(self, path):
+        """Return (size, mtime, created) for path, or None if it is not in the store."""
+        if self._db is None:
+            return self._mem.get(path)
+        self._flush()
+        return self._db.execute("SELECT size, mtime, created FROM files WHERE path = ?", (path,)).fetchone()
+
+    def get_many(self, paths):
+        """Return {path: (size, mtime, created)} for the given paths that are in the store."""
+        if self._db is None:
+            mem = self._mem
+            return {p: mem[p] for p in paths if p in mem}
+        self._flush()
+        paths = list(paths)
+        found = {}
+        for i in range(0, len(paths), 500):
+            chunk = paths[i:i + 500]
+            marks = ",".join("?" * len(chunk))
+            for path, size, mtime, created in self._db.execute(
+                f"SELECT path, size, mtime, created FROM files WHERE path IN ({marks})", chunk
+            ):
+                found[path] = (size, mtime, created)
+        return found
+
+    def items(self):
+        """Yield (path, size, mtime, duplicate group id or None) in insertion order, one page at a time."""
+        if self._db is None:
+            # Snapshot the keys so the store can change while this is consumed
+            group_of = self._group_of
+            for path in list(self._mem):
+                entry = self._mem.get(path)
+                if entry is not None:
+                    yield path, entry[0], entry[1], group_of.get(path)
+            return
+        last_id = 0
+        while True:
+            self._flush()
+            rows = self._db.execute(
+                "SELECT id, path, size, mtime, dup_group FROM files WHERE id > ? ORDER BY id LIMIT ?",
+                (last_id, PAGE_SIZE),
+            ).fetchall()
+            if not rows:
+                return
+            for _id, path, size, mtime, group in rows:
+                yield path, size, mtime, group
+            last_id = rows[-1][0]
+
+    def __iter__(self):
+        return (row[0] for row in self.items())
+
+    def remove_many(self, paths):
+        if self._db is None:
+            for path in paths:
+                entry = self._mem.pop(path, None)
+                if entry is not None:
+                    self._count -= 1
+                    self.total_size -= entry[0]
+                    gid = self._group_of.pop(path, None)
+                    if gid is not None:
+                        self._groups[gid].remove(path)
+            return
+        self._flush()
+        paths = list(paths)
+        for i in range(0, len(paths), 500):
+            chunk = paths[i:i + 500]
+            marks = ",".join("?" * len(chunk))
+            size, count = self._db.execute(
+                f"SELECT COALESCE(SUM(size), 0), COUNT(*) FROM files WHERE path IN ({marks})", chunk
+            ).fetchone()
+            self._db.execute(f"DELETE FROM files WHERE path IN ({marks})", chunk)
+            self.total_size -= size
+            self._count -= count
+        self._db.commit()
+
+    def remove(self, path):
+        self.remove_many([path])
+
+    def find_duplicates(self):
+        """
+        Number the groups of files that share the same file name and mtime,
+        replacing any earlier grouping. Yields after every page of work so a
+        caller can hand control back; read the groups with duplicate_groups().
+        """
+        self.close_groups()
+        if self._db is None:
+            file_map = defaultdict(list)
+            for i, (path, (_size, mtime, _created)) in enumerate(list(self._mem.items()), 1):
+                file_map[(os.path.basename(path), mtime)].append(path)
+                if i % PAGE_SIZE == 0:
+                    yield
+            for group in file_map.values():
+                if len(group) > 1:
+                    gid = len(self._groups)
+                    self._groups.append(group)
+                    for path in group:
+                        self._group_of[path] = gid
+            return
+        self._flush()
+        # Walk the (name, mtime) index in key ranges of about PAGE_SIZE rows, so a
+        # page is bounded however few duplicates there are; a group never spans two ranges
+        last = None
+        gid = -1
+        while True:
+            where, params = [], []
+            if last is not None:
+                where.append("(name, mtime) > (?, ?)")
+                params.extend(last)
+            after = f"WHERE {where[0]}" if where else ""
+            bound = self._db.execute(
+                f"SELECT name, mtime FROM files {after} ORDER BY name, mtime LIMIT 1 OFFSET ?", params + [PAGE_SIZE]
+            ).fetchone()
+            if bound is not None:
+                where.append("(name, mtime) <= (?, ?)")
+                params.extend(bound)
+            in_range = f"WHERE {' AND '.join(where)}" if where else ""
+            rows = self._db.execute(
+                "SELECT f.id, f.name, f.mtime FROM files f JOIN "
+                f"(SELECT name, mtime FROM files {in_range} GROUP BY name, mtime HAVING COUNT(*) > 1) d "
+                "ON f.name = d.name AND f.mtime = d.mtime ORDER BY f.name, f.mtime, f.id",
+                params,
+            ).fetchall()
+            updates, key = [], None
+            for row_id, name, mtime in rows:
+                if (name, mtime) != key:
+                    key = (name, mtime)
+                    gid += 1
+                updates.append((gid, row_id))
+            if updates:
+                self._db.executemany("UPDATE files SET dup_group = ? WHERE id = ?", updates)
+                self._db.commit()
+            if bound is None:
+                return
+            last = bound
+            yield
+
+    def duplicate_groups(self, after=-1, limit=PAGE_SIZE):
+        """
+        Return one page of duplicate groups: up to limit (group id, [(path, size, mtime, created), ...])
+        pairs with ids above after, in id order, files in the order they were added.
+        Groups left with fewer than two files are skipped. Pass the last id as
+        after to get the next page; an empty list means there are no more.
+        """
+        if self._db is None:
+            page = []
+            for gid in range(after + 1, len(self._groups)):
+                paths = self._groups[gid]
+                if len(paths) > 1:
+                    page.append((gid, [(p,) + self._mem[p] for p in paths]))
+                    if len(page) >= limit:
+                        break
+            return page
+        self._flush()
+        gids = [row[0] for row in self._db.execute(
+            "SELECT dup_group FROM files WHERE dup_group > ? GROUP BY dup_group HAVING COUNT(*) > 1 "
+            "ORDER BY dup_group LIMIT ?", (after, limit)
+        )]
+        if not gids:
+            return []
+        groups = {gid: [] for gid in gids}
+        for gid, path, size, mtime, created in self._db.execute(
+            "SELECT dup_group, path, size, mtime, created FROM files WHERE dup_group BETWEEN ? AND ? "
+            "ORDER BY dup_group, id",
+            (gids[0], gids[-1]),
+        ):
+            if gid in groups:
+                groups[gid].append((path, size, mtime, created))
+        return list(groups.items())
+
+    def close_groups(self, group_ids=None):
+        """Take the given groups (default: all) off the duplicate list; their files stay in the store."""
+        if self._db is None:
+            if group_ids is None:
+                self._group_of = {}
+                self._groups = []
+                return
+            for gid in group_ids:
+                for path in self._groups[gid]:
+                    self._group_of.pop(path, None)
+                self._groups[gid] = []
+            return
+        if group_ids is None:
+            self._db.execute("UPDATE files SET dup_group = NULL WHERE dup_group IS NOT NULL")
+        else:
+            group_ids = list(group_ids)
+            for i in range(0, len(group_ids), 500):
+                chunk = group_ids[i:i + 500]
+                marks = ",".join("?" * len(chunk))
+                self._db.execute(f"UPDATE files SET dup_group = NULL WHERE dup_group IN ({marks})", chunk)
+        self._db.commit()
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+            self._seen = None
+            try:
+                os.remove(self._db_path)
+            except OSError:
+                pass
+        self._mem = {}
+        self._group_of = {}
+        self._groups = []
+        self._pending = []
+        self._pending_paths = set()
+        self._count = 0
+        self.total_size = 0
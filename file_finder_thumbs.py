@@ -0,0 +1,151 @@
+import hashlib
+import os
+import shutil
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from file_finder_cache import get_cache_dir
+
+IMAGE_EXTS = {".jpg", ".jpeg", ".png", ".gif", ".bmp", ".tiff"}
+VIDEO_EXTS = {".mp4", ".avi", ".mov", ".mkv", ".wmv"}
+
+THUMB_SIZE = (160, 160)
+CACHE_MAX_BYTES = 200 * 1024 * 1024
+WORKERS = 2
+
+def can_preview(path):
+    ext = os.path.splitext(path)[1].lower()
+    return ext in IMAGE_EXTS or ext in VIDEO_EXTS
+
+class ThumbnailCache:
+    """
+    Thumbnails for image/video files, generated in a small thread pool.
+
+    Each source is downscaled once to a PNG stored on disk under a key made
+    from (path, size, mtime), so a changed file gets a new thumbnail. The
+    cache folder is kept under max_bytes by deleting the least recently
+    used thumbnails (a hit touches the file's mtime). Images need Pillow,
+    videos need ffmpeg on PATH; without them request() resolves to None.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=CACHE_MAX_BYTES, workers=WORKERS, size=THUMB_SIZE):
+        self.cache_dir = cache_dir or get_cache_dir("thumbs")
+        self.max_bytes = max_bytes
+        self.size = size
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="thumbs")
+        self._pending = {}  # cache file -> Future
+        self._lock = threading.Lock()
+        self._used_bytes = None  # computed on first write
+
+    def cache_file(self, path, size, mtime):
+        key = hashlib.sha1(f"{path}|{size}|{mtime}".encode("utf-8", "surrogatepass")).hexdigest()
+        return os.path.join(self.cache_dir, key + ".png")
+
+    def lookup(self, path, size, mtime):
+        """Return the cached thumbnail file, or None if it has not been made yet."""
+        thumb = self.cache_file(path, size, mtime)
+        try:
+            os.utime(thumb)  # mark as recently used
+        except OSError:
+            return None
+        return thumb
+
+    def request(self, path, size, mtime):
+        """Return a Future for the thumbnail file; it resolves to None if no preview can be made."""
+        thumb = self.cache_file(path, size, mtime)
+        with self._lock:
+            future = self._pending.get(thumb)
+            if future is not None:
+                return future
+            future = self._pool.submit(self._make, path, thumb)
+            self._pending[thumb] = future
+        # Outside the lock: a future that has already finished runs the callback right here
+        future.add_done_callback(lambda f, t=thumb: self._forget(t))
+        return future
+
+    def _forget(self, thumb):
+        with self._lock:
+            self._pending.pop(thumb, None)
+
+    def _make(self, path, thumb):
+        if os.path.exists(thumb):
+            os.utime(thumb)
+            return thumb
+        ext = os.path.splitext(path)[1].lower()
+        tmp = thumb + f".{threading.get_ident()}.tmp"
+        try:
+            if ext in IMAGE_EXTS:
+                made = self._make_image(path, tmp)
+            elif ext in VIDEO_EXTS:
+                made = self._make_video(path, tmp)
+            else:
+                made = False
+            if not made:
+                return None
+            os.replace(tmp, thumb)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        self._account(os.path.getsize(thumb))
+        return thumb
+
+    def _make_image(self, path, out):
+        try:
+            from PIL import Image
+        except ImportError:
+            return False
+        from file_finder_archives import is_virtual, open_member
+        if is_virtual(path):
+            import io
+            # Images inside archives are read into memory (PIL needs to seek)
+            with open_member(path) as f:
+                source = io.BytesIO(f.read())
+        else:
+            source = path
+        with Image.open(source) as img:
+            # Let the JPEG decoder downscale while decoding, much cheaper than a full decode
+            img.draft("RGB", self.size)
+            img.thumbnail(self.size)
+            if img.mode not in ("RGB", "RGBA", "L", "P"):
+                img = img.convert("RGB")
+            img.save(out, "PNG")
+        return True
+
+    def _make_video(self, path, out):
+        from file_finder_archives import is_virtual
+        ffmpeg = shutil.which("ffmpeg")
+        if not ffmpeg or is_virtual(path):
+            return False
+        w, h = self.size
+        cmd = [ffmpeg, "-v", "error", "-ss", "1", "-i", path, "-frames:v", "1",
+               "-vf", f"scale={w}:{h}:force_original_aspect_ratio=decrease", "-f", "image2", "-c:v", "png", "-y", out]
+        # No console window flashing up on Windows
+        flags = getattr(subprocess, "CREATE_NO_WINDOW", 0)
+        result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, creationflags=flags, timeout=30)
+        return result.returncode == 0 and os.path.exists(out)
+
+    def _account(self, added):
+        with self._lock:
+            if self._used_bytes is None:
+                self._used_bytes = sum(e.stat().st_size for e in os.scandir(self.cache_dir) if e.name.endswith(".png"))
+            else:
+                self._used_bytes += added
+            if self._used_bytes <= self.max_bytes:
+                return
+            # Evict least recently used down to 90% so this doesn't run on every write
+            entries = sorted(
+                (e.stat().st_mtime, e.stat().st_size, e.path) for e in os.scandir(self.cache_dir) if e.name.endswith(".png")
+            )
+            target = self.max_bytes * 0.9
+            for _mtime, size, file in entries:
+                if self._used_bytes <= target:
+                    break
+                try:
+                    os.remove(file)
+                    self._used_bytes -= size
+                except OSError:
+                    pass
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)